@@ -1,29 +1,61 @@
+import asyncio
 import tiktoken
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI
 from newspaper import Article
 import csv
 from datetime import datetime
 import os
-import subprocess
-import time
 import re
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+import functools
+from urllib.parse import urlparse
+import tldextract
+from aiolimiter import AsyncLimiter
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional
 import uvicorn
 import json
-from neo4j import GraphDatabase
+from git import Repo
+from git.exc import GitError
+from neo4j import GraphDatabase, READ_ACCESS
 from neo4j.exceptions import ServiceUnavailable, AuthError
 
 # Note: This script requires python-dateutil for better date parsing
-# Install with: pip install python-dateutil fastapi uvicorn neo4j
+# Install with: pip install python-dateutil fastapi uvicorn neo4j httpx orjson tldextract GitPython aiolimiter
 
 # --- CONFIG ---
-client = OpenAI()
+# One pooled HTTP/2 client for all OpenAI calls so connections and TLS sessions are reused
+client = AsyncOpenAI(
+    http_client=httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+    )
+)
 model = "gpt-4o-mini"
+MAX_CONCURRENT_ARTICLES = 10  # Articles fetched/summarized at the same time
+ARTICLE_FETCH_TIMEOUT = 15  # Seconds to wait for a publisher's page
+ARTICLE_FETCH_USER_AGENT = "Mozilla/5.0 (compatible; ArticleSummarizer/1.0)"
+LARGE_TEXT_CHARS = 20_000  # Texts longer than this are tokenized off the event loop
+MAX_ARTICLES_PER_CALL = 5  # Beyond this, a bigger multi-article prompt costs more latency than it saves
+MAX_BATCH_API_URLS = 100  # Limit for offline jobs submitted to the OpenAI Batch API
+BATCH_API_DISCOUNT = 0.5  # Batch API requests are billed at half the regular price
+BATCH_MARKER_DIR = "batch_jobs"  # Marker files for Batch API jobs whose results were already logged/stored
 LOG_FILE = "token_usage.csv"
+USAGE_LOG_BATCH_SIZE = 50  # Max rows written to LOG_FILE at once
+USAGE_LOG_FLUSH_SECONDS = 1.0  # Max time a row waits before being written
 GITHUB_COMMIT_BRANCH = "main"  # Change if your branch is different
+GIT_PUSH_INTERVAL_SECONDS = 10  # Saved files arriving within this window share one commit + push
+API_RELOAD = os.getenv("API_RELOAD", "false").lower() == "true"  # Auto-reload for development (single process)
+API_WORKERS = int(os.getenv("API_WORKERS", os.cpu_count() or 1))
+
+# OpenAI account quota, shared out between the worker processes
+OPENAI_RPM_LIMIT = int(os.getenv("OPENAI_RPM_LIMIT", 500))
+OPENAI_TPM_LIMIT = int(os.getenv("OPENAI_TPM_LIMIT", 200_000))
+MAX_SUMMARY_TOKENS = 1000  # max_completion_tokens for one article's summary
 
 # Neo4j Configuration
 NEO4J_URI = os.getenv("NEO4J_URI", "bolt://localhost:7687")
@@ -38,11 +70,39 @@ MODEL_PRICING = {
     "default": {"input": 1.00, "output": 1.00},
 }
 
+# Common date formats found near the top of article text
+DATE_PATTERNS = (
+    r'\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{1,2},?\s+\d{4}\b',
+    r'\b\d{1,2}/\d{1,2}/\d{4}\b',
+    r'\b\d{1,2}-\d{1,2}-\d{4}\b',
+    r'\b\d{4}-\d{1,2}-\d{1,2}\b'
+)
+_DATE_COMBINED = re.compile("|".join(f"(?:{p})" for p in DATE_PATTERNS), re.IGNORECASE)
+
+SYSTEM_PROMPT = """
+Style: Write in AP style. Be concise, factual, and avoid opinion or interpretation.
+
+Length: Summaries must be 3 paragraphs. Each paragraph should be 2–4 sentences. Each summary must begin with the article's published date in AP date format (e.g., Feb. 21, 2025).
+
+Tone: Neutral and professional. Do not insert analysis, speculation, or commentary.
+
+Content: Capture the main developments, essential context, and key quotes or statistics if available. Avoid minor details or redundancy.
+
+Headline: Use the exact headline provided in the prompt for the article and place it at the top of the summary.
+
+Sources: At the end of every summary, include a source line crediting the publisher.
+- Use the exact source provided in the prompt.
+- Do not invent sources. Do not omit sources.
+- Always output in plain text, not markdown or hyperlinks.
+"""
+SYSTEM_MSG = {"role": "system", "content": SYSTEM_PROMPT}
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Article Summarizer API",
     description="API for summarizing articles using OpenAI GPT models with Neo4j storage",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware for PHP app access
@@ -79,9 +139,25 @@ class Neo4jService:
             print(f"✗ Unexpected Neo4j error: {e}")
             return False
     
+    def verify_connectivity(self):
+        """Check the long-lived driver is reachable without opening a new one"""
+        if not self.driver:
+            return self.connect()
+        try:
+            self.driver.verify_connectivity()
+            return True
+        except Exception as e:
+            print(f"✗ Neo4j connectivity check failed: {e}")
+            return False
+    
     def close(self):
         if self.driver:
             self.driver.close()
+            self.driver = None
+    
+    def _read_session(self):
+        """Session for read-only queries, so clusters can route them to read replicas"""
+        return self.driver.session(database=self.database, default_access_mode=READ_ACCESS)
     
     def create_constraints_and_indexes(self):
         """Create constraints and indexes for better performance"""
@@ -90,92 +166,115 @@ class Neo4jService:
                 # Create constraints
                 session.run("CREATE CONSTRAINT article_url IF NOT EXISTS FOR (a:Article) REQUIRE a.url IS UNIQUE")
                 session.run("CREATE CONSTRAINT source_name IF NOT EXISTS FOR (s:Source) REQUIRE s.name IS UNIQUE")
+                session.run("CREATE CONSTRAINT stats_id IF NOT EXISTS FOR (st:Stats) REQUIRE st.id IS UNIQUE")
                 
                 # Create indexes
                 session.run("CREATE INDEX article_date IF NOT EXISTS FOR (a:Article) ON (a.publication_date)")
                 session.run("CREATE INDEX article_headline IF NOT EXISTS FOR (a:Article) ON (a.headline)")
                 
+                # Back get_articles: newest-first ordering, and date range filters with that ordering
+                session.run("CREATE INDEX article_processed IF NOT EXISTS FOR (a:Article) ON (a.processed_at)")
+                session.run("CREATE INDEX article_date_processed IF NOT EXISTS FOR (a:Article) ON (a.publication_date, a.processed_at)")
+                
                 print("✓ Neo4j constraints and indexes created")
         except Exception as e:
             print(f"⚠ Warning: Could not create constraints/indexes: {e}")
     
-    def store_article(self, article_data):
-        """Store article summary in Neo4j"""
+    def ensure_statistics_node(self):
+        """Create the running-totals Stats node, backfilling it once from existing articles"""
         try:
             with self.driver.session(database=self.database) as session:
-                # Create or merge article node
-                article_query = """
-                MERGE (a:Article {url: $url})
-                SET a.headline = $headline,
-                    a.publication_date = $publication_date,
-                    a.summary = $summary,
-                    a.tokens_used = $tokens_used,
-                    a.cost_usd = $cost_usd,
-                    a.processed_at = datetime()
-                RETURN a
-                """
+                if session.run("MATCH (st:Stats {id: 'global'}) RETURN st").single():
+                    return
                 
-                # Create or merge source node
-                source_query = """
-                MERGE (s:Source {name: $source_name})
-                RETURN s
+                backfill_query = """
+                OPTIONAL MATCH (a:Article)
+                WITH count(a) as total_articles,
+                     coalesce(sum(a.tokens_used), 0) as total_tokens,
+                     coalesce(sum(a.cost_usd), 0.0) as total_cost
+                MERGE (st:Stats {id: 'global'})
+                ON CREATE SET st.total_articles = total_articles,
+                              st.total_tokens = total_tokens,
+                              st.total_cost = total_cost
                 """
-                
-                # Create relationship between article and source
-                relationship_query = """
-                MATCH (a:Article {url: $url})
-                MATCH (s:Source {name: $source_name})
-                MERGE (a)-[:PUBLISHED_BY]->(s)
-                RETURN a, s
-                """
-                
-                # Execute queries
-                session.run(article_query, article_data)
-                session.run(source_query, {"source_name": article_data["source"]})
-                session.run(relationship_query, {
-                    "url": article_data["url"],
-                    "source_name": article_data["source"]
-                })
-                
+                session.run(backfill_query).consume()
+                print("✓ Neo4j statistics node initialized")
+        except Exception as e:
+            print(f"⚠ Warning: Could not initialize statistics node: {e}")
+    
+    def store_article(self, article_data):
+        """Store article summary in Neo4j"""
+        return self.store_articles_bulk([article_data])
+    
+    def store_articles_bulk(self, articles):
+        """Store many article summaries in Neo4j with one query in a single transaction"""
+        if not articles:
+            return True
+        
+        # One row per URL, so the running totals below see each article once
+        articles = list({article["url"]: article for article in articles}.values())
+        
+        # Article, source and relationship are merged per row in one parameterized statement.
+        # The global Stats node is adjusted by the difference from any previous summary of the
+        # same URL, so re-summarizing an article does not double count it.
+        query = """
+        UNWIND $articles AS row
+        MERGE (s:Source {name: row.source})
+        MERGE (a:Article {url: row.url})
+        WITH row, s, a,
+             CASE WHEN a.tokens_used IS NULL THEN 1 ELSE 0 END as is_new,
+             coalesce(a.tokens_used, 0) as old_tokens,
+             coalesce(a.cost_usd, 0.0) as old_cost
+        SET a.headline = row.headline,
+            a.publication_date = row.publication_date,
+            a.summary = row.summary,
+            a.tokens_used = row.tokens_used,
+            a.cost_usd = row.cost_usd,
+            a.processed_at = datetime()
+        MERGE (a)-[:PUBLISHED_BY]->(s)
+        WITH sum(is_new) as new_articles,
+             sum(row.tokens_used - old_tokens) as token_delta,
+             sum(row.cost_usd - old_cost) as cost_delta
+        MERGE (st:Stats {id: 'global'})
+        ON CREATE SET st.total_articles = 0, st.total_tokens = 0, st.total_cost = 0.0
+        SET st.total_articles = st.total_articles + new_articles,
+            st.total_tokens = st.total_tokens + token_delta,
+            st.total_cost = st.total_cost + cost_delta
+        """
+        
+        def write_articles(tx):
+            tx.run(query, {"articles": articles}).consume()
+        
+        try:
+            with self.driver.session(database=self.database) as session:
+                session.execute_write(write_articles)
                 return True
         except Exception as e:
-            print(f"✗ Error storing article in Neo4j: {e}")
+            print(f"✗ Error storing articles in Neo4j: {e}")
             return False
     
     def get_articles(self, limit=50, source=None, date_from=None, date_to=None):
         """Retrieve articles from Neo4j with optional filters"""
         try:
-            with self.driver.session(database=self.database) as session:
+            with self._read_session() as session:
+                # One static query text for every filter combination, so the planner caches a single plan
                 query = """
                 MATCH (a:Article)-[:PUBLISHED_BY]->(s:Source)
-                """
-                
-                params = {}
-                where_clauses = []
-                
-                if source:
-                    where_clauses.append("s.name = $source")
-                    params["source"] = source
-                
-                if date_from:
-                    where_clauses.append("a.publication_date >= $date_from")
-                    params["date_from"] = date_from
-                
-                if date_to:
-                    where_clauses.append("a.publication_date <= $date_to")
-                    params["date_to"] = date_to
-                
-                if where_clauses:
-                    query += " WHERE " + " AND ".join(where_clauses)
-                
-                query += """
+                WHERE ($source IS NULL OR s.name = $source)
+                  AND ($date_from IS NULL OR a.publication_date >= $date_from)
+                  AND ($date_to IS NULL OR a.publication_date <= $date_to)
                 RETURN a.url as url, a.headline as headline, a.publication_date as publication_date,
                        a.summary as summary, a.tokens_used as tokens_used, a.cost_usd as cost_usd,
-                       s.name as source, a.processed_at as processed_at
+                       s.name as source, toString(a.processed_at) as processed_at
                 ORDER BY a.processed_at DESC
                 LIMIT $limit
                 """
-                params["limit"] = limit
+                params = {
+                    "source": source or None,
+                    "date_from": date_from or None,
+                    "date_to": date_to or None,
+                    "limit": limit
+                }
                 
                 result = session.run(query, params)
                 articles = [dict(record) for record in result]
@@ -184,10 +283,28 @@ class Neo4jService:
             print(f"✗ Error retrieving articles from Neo4j: {e}")
             return []
     
+    def get_articles_by_urls(self, urls):
+        """Look up already-summarized articles for many URLs in one query, keyed by URL"""
+        try:
+            with self._read_session() as session:
+                query = """
+                MATCH (a:Article)
+                WHERE a.url IN $urls AND a.summary IS NOT NULL
+                OPTIONAL MATCH (a)-[:PUBLISHED_BY]->(s:Source)
+                RETURN a.url as url, a.headline as headline, a.publication_date as publication_date,
+                       s.name as source, a.summary as summary, a.tokens_used as tokens_used,
+                       a.cost_usd as cost_usd
+                """
+                result = session.run(query, {"urls": urls})
+                return {record["url"]: dict(record) for record in result}
+        except Exception as e:
+            print(f"✗ Error looking up cached articles in Neo4j: {e}")
+            return {}
+    
     def get_sources(self):
         """Get all unique sources"""
         try:
-            with self.driver.session(database=self.database) as session:
+            with self._read_session() as session:
                 query = """
                 MATCH (s:Source)
                 RETURN s.name as name, count((s)<-[:PUBLISHED_BY]-()) as article_count
@@ -203,13 +320,16 @@ class Neo4jService:
     def get_statistics(self):
         """Get summary statistics"""
         try:
-            with self.driver.session(database=self.database) as session:
+            with self._read_session() as session:
+                # Running totals maintained by store_articles_bulk, no Article scan
                 query = """
-                MATCH (a:Article)
-                RETURN count(a) as total_articles,
-                       sum(a.tokens_used) as total_tokens,
-                       sum(a.cost_usd) as total_cost,
-                       avg(a.cost_usd) as avg_cost_per_article
+                MATCH (st:Stats {id: 'global'})
+                RETURN st.total_articles as total_articles,
+                       st.total_tokens as total_tokens,
+                       st.total_cost as total_cost,
+                       CASE WHEN st.total_articles > 0
+                            THEN st.total_cost / st.total_articles
+                            ELSE null END as avg_cost_per_article
                 """
                 result = session.run(query)
                 stats = result.single()
@@ -221,6 +341,25 @@ class Neo4jService:
 # Initialize Neo4j service
 neo4j_service = Neo4jService(NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD, NEO4J_DATABASE)
 
+@app.on_event("startup")
+def startup_neo4j():
+    """Open the shared Neo4j driver once per worker process."""
+    if neo4j_service.connect():
+        neo4j_service.create_constraints_and_indexes()
+        neo4j_service.ensure_statistics_node()
+    else:
+        print("⚠ Warning: Neo4j connection failed. Some features may not work.")
+
+@app.on_event("shutdown")
+async def shutdown_resources():
+    """Release the Neo4j driver, HTTP connection pools and worker threads."""
+    # Let queued pool work (e.g. Neo4j writes after a streamed summary) finish before the driver closes
+    await asyncio.to_thread(parse_pool.shutdown, wait=True)
+    neo4j_service.close()
+    await client.close()
+    await article_http_client.aclose()
+    print("Neo4j connection closed.")
+
 # --- PYDANTIC MODELS ---
 class SummarizeRequest(BaseModel):
     urls: List[str]
@@ -228,12 +367,18 @@ class SummarizeRequest(BaseModel):
     save_to_file: Optional[bool] = False
     output_format: Optional[str] = "txt"
     store_in_neo4j: Optional[bool] = True
+    use_cache: Optional[bool] = True  # Reuse summaries already stored in Neo4j for the same URL
+    articles_per_call: Optional[int] = 1  # Articles summarized together in one OpenAI call
 
-class SummarizeResponse(BaseModel):
-    success: bool
-    message: str
-    data: Optional[dict] = None
-    error: Optional[str] = None
+class StreamSummarizeRequest(BaseModel):
+    url: str
+    model: Optional[str] = "gpt-4o-mini"
+    store_in_neo4j: Optional[bool] = True
+
+class BatchSummarizeRequest(BaseModel):
+    urls: List[str]
+    model: Optional[str] = "gpt-4o-mini"
+    store_in_neo4j: Optional[bool] = True
 
 class ArticleSummary(BaseModel):
     url: str
@@ -251,11 +396,46 @@ class Neo4jQueryRequest(BaseModel):
     date_to: Optional[str] = None
 
 # --- HELPERS ---
-def fetch_article_text(url: str) -> tuple[str, str, str, str]:
-    """Fetch and clean main article text, publication date, source, and headline using newspaper4k."""
+# Shared across requests so repeat fetches from the same publisher reuse TCP + TLS connections
+article_http_client = httpx.AsyncClient(
+    http2=True,
+    timeout=ARTICLE_FETCH_TIMEOUT,
+    follow_redirects=True,
+    limits=httpx.Limits(max_keepalive_connections=50),
+    headers={"User-Agent": ARTICLE_FETCH_USER_AGENT}
+)
+
+# Thread pool for blocking newspaper/lxml parsing, tiktoken encoding and deferred writes, so the event loop stays free
+parse_pool = ThreadPoolExecutor(max_workers=16)
+
+# Uses the bundled Public Suffix List snapshot so no network fetch happens on the request path
+_domain_extractor = tldextract.TLDExtract(suffix_list_urls=())
+
+def extract_source(url: str) -> str:
+    """Source name for a URL: its registered domain, e.g. "news.bbc.co.uk" -> "bbc.co.uk"."""
+    domain = _domain_extractor(url).registered_domain
+    if domain:
+        return domain
+    
+    # IP addresses, localhost, etc.: fall back to the host without a www. prefix
+    source = urlparse(url).netloc
+    return source[4:] if source.startswith('www.') else source
+
+def _parse_article(url: str, html: str) -> Article:
+    """Parse already-fetched HTML with newspaper4k (CPU-bound, runs in parse_pool)."""
     article = Article(url)
-    article.download()
+    article.download(input_html=html)
     article.parse()
+    return article
+
+async def fetch_article_text(url: str) -> tuple[str, str, str, str]:
+    """Fetch and clean main article text, publication date, source, and headline using newspaper4k."""
+    response = await article_http_client.get(url)
+    response.raise_for_status()
+    html = response.text
+    
+    loop = asyncio.get_running_loop()
+    article = await loop.run_in_executor(parse_pool, _parse_article, url, html)
     
     # Try multiple methods to get the publication date
     pub_date = None
@@ -279,23 +459,16 @@ def fetch_article_text(url: str) -> tuple[str, str, str, str]:
     if not pub_date:
         # Look for common date patterns in the first 1000 characters
         text_sample = article.text[:1000]
-        date_patterns = [
-            r'\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{1,2},?\s+\d{4}\b',
-            r'\b\d{1,2}/\d{1,2}/\d{4}\b',
-            r'\b\d{1,2}-\d{1,2}-\d{4}\b',
-            r'\b\d{4}-\d{1,2}-\d{1,2}\b'
-        ]
-        
-        for pattern in date_patterns:
-            match = re.search(pattern, text_sample, re.IGNORECASE)
-            if match:
-                try:
-                    from dateutil import parser
-                    parsed_date = parser.parse(match.group())
-                    pub_date = parsed_date.strftime("%b. %d, %Y")
-                    break
-                except:
-                    continue
+        
+        # Single scan for any known date format; take the first one that parses
+        for match in _DATE_COMBINED.finditer(text_sample):
+            try:
+                from dateutil import parser
+                parsed_date = parser.parse(match.group())
+                pub_date = parsed_date.strftime("%b. %d, %Y")
+                break
+            except:
+                continue
     
     # Method 4: Use current date as fallback if all else fails
     if not pub_date:
@@ -306,27 +479,69 @@ def fetch_article_text(url: str) -> tuple[str, str, str, str]:
     # Extract headline from the article
     headline = article.title.strip() if article.title else "No headline available"
     
-    # Extract source from URL domain
-    from urllib.parse import urlparse
-    parsed_url = urlparse(url)
-    source = parsed_url.netloc
-    
-    # Clean up the source (remove www. prefix and get the main domain)
-    if source.startswith('www.'):
-        source = source[4:]
-    
-    # Handle common cases where we want the main domain, not subdomains
-    # For example: "news.ithacavoice.com" -> "ithacavoice.com"
-    if source.count('.') > 1:
-        parts = source.split('.')
-        if len(parts) >= 2:
-            source = '.'.join(parts[-2:])
+    source = extract_source(url)
     
     return article.text.strip(), pub_date, source, headline
 
+@functools.lru_cache(maxsize=8)
+def _enc(model: str) -> tiktoken.Encoding:
+    """Look up the tiktoken encoder for a model once and reuse it."""
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        # Models newer than the installed tiktoken: the 4o-family encoding is the closest match
+        return tiktoken.get_encoding("o200k_base")
+
 def count_tokens(text: str, model: str) -> int:
-    encoding = tiktoken.encoding_for_model(model)
-    return len(encoding.encode(text))
+    return len(_enc(model).encode_ordinary(text))
+
+@functools.lru_cache(maxsize=8)
+def system_prompt_tokens(model: str) -> int:
+    """Token count of SYSTEM_PROMPT, computed once per model."""
+    return count_tokens(SYSTEM_PROMPT, model)
+
+def count_message_tokens(messages: List[dict], model: str) -> int:
+    """Token count of a messages list: cached for SYSTEM_MSG, one encode for everything else."""
+    total = 0
+    contents = []
+    for m in messages:
+        if m is SYSTEM_MSG:
+            total += system_prompt_tokens(model)
+        else:
+            contents.append(m["content"])
+    if len(contents) == 1:
+        # The usual system + user case; the batch call would build a thread pool for one string
+        total += len(_enc(model).encode_ordinary(contents[0]))
+    elif contents:
+        # Tokenized together in tiktoken's Rust core, which releases the GIL
+        total += sum(map(len, _enc(model).encode_ordinary_batch(contents)))
+    return total
+
+async def count_message_tokens_async(messages: List[dict], model: str) -> int:
+    """Count message tokens, moving the encode into parse_pool for very large prompts."""
+    if sum(len(m["content"]) for m in messages if m is not SYSTEM_MSG) < LARGE_TEXT_CHARS:
+        return count_message_tokens(messages, model)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(parse_pool, count_message_tokens, messages, model)
+
+async def estimate_message_tokens(messages: List[dict], model: str) -> int:
+    """Pre-flight token estimate for rate limiting; never fails, falls back to ~4 characters per token."""
+    try:
+        return await count_message_tokens_async(messages, model)
+    except Exception as e:
+        print(f"⚠ Warning: Token estimate failed for {model}, using character count: {e}")
+        return sum(len(m["content"]) for m in messages) // 4
+
+# Token buckets refilled continuously over each 60s window, like the openai-cookbook parallel processor
+_limiter_workers = 1 if API_RELOAD else max(1, API_WORKERS)
+rpm_limiter = AsyncLimiter(max(1, OPENAI_RPM_LIMIT // _limiter_workers), 60)
+tpm_limiter = AsyncLimiter(max(1, OPENAI_TPM_LIMIT // _limiter_workers), 60)
+
+async def wait_for_rate_limit(estimated_tokens: int):
+    """Wait until one more request using estimated_tokens fits in the RPM and TPM budgets."""
+    await rpm_limiter.acquire()
+    # A single request larger than the whole bucket can only wait for a full bucket
+    await tpm_limiter.acquire(min(estimated_tokens, tpm_limiter.max_rate))
 
 def estimate_cost(model: str, prompt_tokens: int, output_tokens: int) -> float:
     pricing = MODEL_PRICING.get(model, MODEL_PRICING["default"])
@@ -334,33 +549,160 @@ def estimate_cost(model: str, prompt_tokens: int, output_tokens: int) -> float:
     output_cost = (output_tokens / 1_000_000) * pricing["output"]
     return input_cost + output_cost
 
+# Usage rows are queued by log_usage and appended to LOG_FILE in batches by _csv_writer_loop
+usage_queue: asyncio.Queue = asyncio.Queue()
+usage_writer_task: Optional[asyncio.Task] = None
+
+def _ensure_usage_log_header():
+    """Create LOG_FILE with its header row if it does not exist yet."""
+    if not os.path.isfile(LOG_FILE):
+        with open(LOG_FILE, "w", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerow(["timestamp", "model", "prompt_tokens", "output_tokens", "total_tokens", "cost_usd"])
+
+def _write_usage_rows(rows: list):
+    """Append a batch of usage rows to LOG_FILE in one write; errors are logged, not raised."""
+    try:
+        with open(LOG_FILE, "a", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerows(rows)
+        print(f"Logged {len(rows)} token usage rows to {LOG_FILE}")
+    except OSError as e:
+        # Keep the writer loop alive so later rows are still drained and written
+        print(f"✗ Error writing {len(rows)} token usage rows to {LOG_FILE}: {e}")
+
+def _drain_usage_queue(batch: list) -> list:
+    """Move every row currently waiting in usage_queue into batch."""
+    while not usage_queue.empty():
+        batch.append(usage_queue.get_nowait())
+    return batch
+
+async def _csv_writer_loop():
+    """Write queued usage rows every USAGE_LOG_BATCH_SIZE rows or USAGE_LOG_FLUSH_SECONDS."""
+    loop = asyncio.get_running_loop()
+    batch = []
+    try:
+        while True:
+            batch.append(await usage_queue.get())
+            deadline = loop.time() + USAGE_LOG_FLUSH_SECONDS
+            while len(batch) < USAGE_LOG_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(usage_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            rows, batch = batch, []
+            await asyncio.to_thread(_write_usage_rows, rows)
+    except asyncio.CancelledError:
+        # Flush whatever is still pending before the worker exits
+        rows = _drain_usage_queue(batch)
+        if rows:
+            _write_usage_rows(rows)
+        raise
+
+@app.on_event("startup")
+async def start_usage_logger():
+    """Check the CSV header once and start the background usage writer."""
+    global usage_writer_task
+    _ensure_usage_log_header()
+    usage_writer_task = asyncio.create_task(_csv_writer_loop())
+
+@app.on_event("shutdown")
+async def stop_usage_logger():
+    """Stop the usage writer after it has flushed pending rows."""
+    if usage_writer_task:
+        usage_writer_task.cancel()
+        try:
+            await usage_writer_task
+        except asyncio.CancelledError:
+            pass
+
 def log_usage(model: str, prompt_tokens: int, output_tokens: int, total_tokens: int, cost_usd: float):
-    """Append token usage + cost to CSV."""
-    file_exists = os.path.isfile(LOG_FILE)
-    with open(LOG_FILE, "a", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        if not file_exists:
-            writer.writerow(["timestamp", "model", "prompt_tokens", "output_tokens", "total_tokens", "cost_usd"])
-        writer.writerow([
-            datetime.utcnow().isoformat(),
-            model,
-            prompt_tokens,
-            output_tokens,
-            total_tokens,
-            round(cost_usd, 6)
-        ])
-    print(f"Logged token usage to {LOG_FILE}")
-
-def git_push_commit(file_path: str, commit_message: str):
-    """Stage, commit, and push a file using local Git CLI."""
+    """Queue token usage + cost for the background CSV writer (non-blocking)."""
+    usage_queue.put_nowait([
+        datetime.utcnow().isoformat(),
+        model,
+        prompt_tokens,
+        output_tokens,
+        total_tokens,
+        round(cost_usd, 6)
+    ])
+
+def git_push_commit(file_paths: List[str], commit_message: str):
+    """Stage, commit, and push files with GitPython (index and commit are handled in-process)."""
     try:
-        subprocess.run(["git", "add", file_path], check=True)
-        subprocess.run(["git", "commit", "-m", commit_message], check=True)
-        subprocess.run(["git", "push", "origin", GITHUB_COMMIT_BRANCH], check=True)
+        repo = Repo(os.getcwd(), search_parent_directories=True)
+        repo.index.add([os.path.abspath(path) for path in file_paths])
+        repo.index.commit(commit_message)
+        # A rejected push is reported in the returned PushInfoList rather than raised
+        repo.remote("origin").push(GITHUB_COMMIT_BRANCH).raise_if_error()
         print(f"Changes pushed to GitHub: {commit_message}")
-    except subprocess.CalledProcessError as e:
+    except (GitError, ValueError, OSError) as e:
+        # OSError covers e.g. index.lock held by another worker's pusher
         print(f"Git push failed: {e}")
 
+# Saved files are queued by queue_git_push and committed together by _git_pusher_loop
+git_queue: asyncio.Queue = asyncio.Queue()
+git_pusher_task: Optional[asyncio.Task] = None
+
+def _drain_git_queue(file_paths: List[str]) -> List[str]:
+    """Move every file currently waiting in git_queue into file_paths, skipping duplicates."""
+    while not git_queue.empty():
+        path = git_queue.get_nowait()
+        if path not in file_paths:
+            file_paths.append(path)
+    return file_paths
+
+def _git_commit_message(file_paths: List[str]) -> str:
+    if len(file_paths) == 1:
+        return f"Update summaries file: {file_paths[0]}"
+    return f"Update summaries files: {', '.join(file_paths)}"
+
+async def _git_pusher_loop():
+    """Wait GIT_PUSH_INTERVAL_SECONDS after a file is queued, then push everything queued by then."""
+    file_paths = []
+    try:
+        while True:
+            file_paths.append(await git_queue.get())
+            await asyncio.sleep(GIT_PUSH_INTERVAL_SECONDS)
+            
+            paths, file_paths = _drain_git_queue(file_paths), []
+            try:
+                await asyncio.to_thread(git_push_commit, paths, _git_commit_message(paths))
+            except Exception as e:
+                # One failed push must not stop later saves from being pushed
+                print(f"Git push failed: {e}")
+    except asyncio.CancelledError:
+        # Push whatever is still pending before the worker exits
+        paths = _drain_git_queue(file_paths)
+        if paths:
+            try:
+                git_push_commit(paths, _git_commit_message(paths))
+            except Exception as e:
+                print(f"Git push failed: {e}")
+        raise
+
+@app.on_event("startup")
+async def start_git_pusher():
+    """Start the background task that commits and pushes saved summary files."""
+    global git_pusher_task
+    git_pusher_task = asyncio.create_task(_git_pusher_loop())
+
+@app.on_event("shutdown")
+async def stop_git_pusher():
+    """Stop the git pusher after it has pushed pending files."""
+    if git_pusher_task:
+        git_pusher_task.cancel()
+        try:
+            await git_pusher_task
+        except asyncio.CancelledError:
+            pass
+
+def queue_git_push(file_path: str):
+    """Queue a saved file to be committed and pushed by the background git pusher."""
+    git_queue.put_nowait(file_path)
+
 def save_summaries_to_file(results: dict, filename: str = None, format: str = "txt"):
     """Save summaries to a file in the specified format."""
     if not filename:
@@ -395,79 +737,374 @@ def save_summaries_to_file(results: dict, filename: str = None, format: str = "t
         return None
 
 # --- MAIN FUNCTION ---
-def summarize_article(url: str, model_name: str = "gpt-4o-mini", retries: int = 2) -> dict:
+def build_user_content(article_text: str, pub_date: str, source: str, headline: str) -> str:
+    """User prompt asking for a summary of a single article."""
+    return (
+        f"Summarize the following article in 3 concise paragraphs under 250 words. "
+        f"The summary must begin with the publication date: {pub_date}, "
+        f"include the headline at the top: {headline}, "
+        f"and a source line crediting: {source}\n\n{article_text}"
+    )
+
+async def summarize_article_text(article: dict, model_name: str = "gpt-4o-mini", retries: int = 2) -> dict:
+    """Summarize an already-fetched article, retry if summary is empty."""
+    pub_date = article["publication_date"]
+    source = article["source"]
+    headline = article["headline"]
+
+    user_content = build_user_content(article["text"], pub_date, source, headline)
+
+    messages = [
+        SYSTEM_MSG,
+        {"role": "user", "content": user_content}
+    ]
+
+    # Worst-case tokens per attempt, reserved from the TPM budget before each call
+    estimated_tokens = await estimate_message_tokens(messages, model_name) + MAX_SUMMARY_TOKENS
+
+    for attempt in range(retries + 1):
+        await wait_for_rate_limit(estimated_tokens)
+        response = await client.chat.completions.create(
+            model=model_name,
+            messages=messages,
+            temperature=0.3,
+            max_completion_tokens=MAX_SUMMARY_TOKENS
+        )
+
+        summary = response.choices[0].message.content.strip()
+        # Exact counts from the API, including chat message framing tokens
+        prompt_tokens = response.usage.prompt_tokens
+        output_tokens = response.usage.completion_tokens
+        total_tokens = prompt_tokens + output_tokens
+        cost_usd = estimate_cost(model_name, prompt_tokens, output_tokens)
+
+        log_usage(model_name, prompt_tokens, output_tokens, total_tokens, cost_usd)
+
+        print(f"Attempt {attempt+1} - Input: {prompt_tokens}, Output: {output_tokens}, Total: {total_tokens}, Cost: ${cost_usd:.6f}")
+
+        if summary:
+            return {
+                "headline": headline,
+                "publication_date": pub_date,
+                "source": source,
+                "summary": summary,
+                "tokens_used": total_tokens,
+                "cost_usd": cost_usd
+            }
+        else:
+            print("Summary was empty, retrying...")
+            await asyncio.sleep(1)  # brief pause before retry
+
+    return {"error": "Summary could not be generated after multiple attempts."}
+
+async def fetch_article(url: str) -> dict:
+    """Fetch an article into the dict shape used by the summarizers."""
+    article_text, pub_date, source, headline = await fetch_article_text(url)
+
+    print(f"Extracted publication date: {pub_date}")
+    print(f"Extracted source: {source}")
+    print(f"Extracted headline: {headline}")
+
+    return {
+        "url": url,
+        "text": article_text,
+        "publication_date": pub_date,
+        "source": source,
+        "headline": headline
+    }
+
+async def summarize_article(url: str, model_name: str = "gpt-4o-mini", retries: int = 2) -> dict:
     """Fetch article, summarize, retry if summary is empty."""
     try:
-        article_text, pub_date, source, headline = fetch_article_text(url)
-        
-        print(f"Extracted publication date: {pub_date}")
-        print(f"Extracted source: {source}")
-        print(f"Extracted headline: {headline}")
+        article = await fetch_article(url)
+        return await summarize_article_text(article, model_name, retries)
+    
+    except Exception as e:
+        return {"error": f"Error processing article: {str(e)}"}
 
-        messages = [
-            {"role": "system", "content": """
-Style: Write in AP style. Be concise, factual, and avoid opinion or interpretation.
+async def summarize_articles_batch(articles: List[dict], model_name: str = "gpt-4o-mini") -> List[dict]:
+    """Summarize several fetched articles with one chat completion, one result per article.
+    
+    The model returns a JSON object of indexed summaries. Token usage and cost of the call are
+    split evenly over the articles it covered. Articles missing from the response fall back to
+    a single-article call.
+    """
+    blocks = [
+        f"ARTICLE {i}\n"
+        f"Publication date: {article['publication_date']}\n"
+        f"Headline: {article['headline']}\n"
+        f"Source: {article['source']}\n\n"
+        f"{article['text']}"
+        for i, article in enumerate(articles)
+    ]
+    user_content = (
+        f"Summarize each of the following {len(articles)} articles in 3 concise paragraphs under 250 words. "
+        f"Each summary must begin with that article's publication date, include its headline at the top, "
+        f"and end with a source line crediting its source. "
+        f'Return a JSON object of the form {{"summaries": [{{"index": 0, "summary": "..."}}]}} '
+        f"with one item per article, where index is the article number.\n\n" + "\n\n".join(blocks)
+    )
 
-Length: Summaries must be 3 paragraphs. Each paragraph should be 2–4 sentences. Each summary must begin with the article's published date in AP date format (e.g., Feb. 21, 2025).
+    messages = [SYSTEM_MSG, {"role": "user", "content": user_content}]
+    max_completion_tokens = MAX_SUMMARY_TOKENS * len(articles)
 
-Tone: Neutral and professional. Do not insert analysis, speculation, or commentary.
+    await wait_for_rate_limit(await estimate_message_tokens(messages, model_name) + max_completion_tokens)
+    response = await client.chat.completions.create(
+        model=model_name,
+        messages=messages,
+        temperature=0.3,
+        max_completion_tokens=max_completion_tokens,
+        response_format={"type": "json_object"}
+    )
 
-Content: Capture the main developments, essential context, and key quotes or statistics if available. Avoid minor details or redundancy.
+    content = response.choices[0].message.content or ""
+    prompt_tokens = response.usage.prompt_tokens
+    output_tokens = response.usage.completion_tokens
+    total_tokens = prompt_tokens + output_tokens
+    cost_usd = estimate_cost(model_name, prompt_tokens, output_tokens)
 
-Headline: Use the exact headline provided in the prompt for the article and place it at the top of the summary.
+    log_usage(model_name, prompt_tokens, output_tokens, total_tokens, cost_usd)
 
-Sources: At the end of every summary, include a source line crediting the publisher.
-- Use the exact source provided in the prompt.
-- Do not invent sources. Do not omit sources.
-- Always output in plain text, not markdown or hyperlinks.
-"""},
-
-            {"role": "user", "content": (
-                f"Summarize the following article in 3 concise paragraphs under 250 words. "
-                f"The summary must begin with the publication date: {pub_date}, "
-                f"include the headline at the top: {headline}, "
-                f"and a source line crediting: {source}\n\n{article_text}"
-            )}
-        ]
-
-        for attempt in range(retries + 1):
-            prompt_tokens = sum(count_tokens(m["content"], model_name) for m in messages)
-
-            response = client.chat.completions.create(
-                model=model_name,
-                messages=messages,
-                temperature=0.3,
-                max_completion_tokens=1000
-            )
+    print(f"Batch of {len(articles)} - Input: {prompt_tokens}, Output: {output_tokens}, Total: {total_tokens}, Cost: ${cost_usd:.6f}")
+
+    summaries = {}
+    try:
+        for item in json.loads(content).get("summaries", []):
+            summaries[int(item["index"])] = str(item["summary"]).strip()
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        print(f"Could not parse batch summary response: {e}")
 
-            summary = response.choices[0].message.content.strip()
-            output_tokens = count_tokens(summary, model_name)
-            total_tokens = prompt_tokens + output_tokens
-            cost_usd = estimate_cost(model_name, prompt_tokens, output_tokens)
+    # Each article's share of the call; the first one takes the floor-division remainder so shares add up
+    token_shares = [total_tokens // len(articles)] * len(articles)
+    token_shares[0] += total_tokens % len(articles)
+    cost_share = cost_usd / len(articles)
 
-            log_usage(model_name, prompt_tokens, output_tokens, total_tokens, cost_usd)
+    results = [None] * len(articles)
+    missing = []
+    for i, article in enumerate(articles):
+        if summaries.get(i):
+            results[i] = {
+                "headline": article["headline"],
+                "publication_date": article["publication_date"],
+                "source": article["source"],
+                "summary": summaries[i],
+                "tokens_used": token_shares[i],
+                "cost_usd": cost_share
+            }
+        else:
+            missing.append(i)
 
-            print(f"Attempt {attempt+1} - Input: {prompt_tokens}, Output: {output_tokens}, Total: {total_tokens}, Cost: ${cost_usd:.6f}")
+    if missing:
+        print(f"Batch response missing {len(missing)} summaries, summarizing them individually...")
+        retried = await asyncio.gather(
+            *[summarize_article_text(articles[i], model_name) for i in missing],
+            return_exceptions=True
+        )
+        # A failed fallback only affects its own article, not the summaries already parsed.
+        # Either way the article keeps its share of the batched call, which was billed too.
+        for i, result in zip(missing, retried):
+            if isinstance(result, Exception):
+                result = {"error": f"Error processing article: {str(result)}"}
+            result["tokens_used"] = result.get("tokens_used", 0) + token_shares[i]
+            result["cost_usd"] = result.get("cost_usd", 0) + cost_share
+            results[i] = result
 
-            if summary:
-                return {
-                    "headline": headline,
-                    "publication_date": pub_date,
-                    "source": source,
-                    "summary": summary,
-                    "tokens_used": total_tokens,
-                    "cost_usd": cost_usd
-                }
+    return results
+
+async def open_article_stream(article: dict, model_name: str):
+    """Start a streaming completion for an article; returns (stream, estimated_prompt_tokens).
+    
+    Called before the HTTP response starts, so OpenAI errors can still become a proper error status.
+    """
+    user_content = build_user_content(article["text"], article["publication_date"], article["source"], article["headline"])
+    messages = [SYSTEM_MSG, {"role": "user", "content": user_content}]
+    estimated_prompt_tokens = await estimate_message_tokens(messages, model_name)
+
+    await wait_for_rate_limit(estimated_prompt_tokens + MAX_SUMMARY_TOKENS)
+    stream = await client.chat.completions.create(
+        model=model_name,
+        messages=messages,
+        temperature=0.3,
+        max_completion_tokens=MAX_SUMMARY_TOKENS,
+        stream=True,
+        stream_options={"include_usage": True}
+    )
+    return stream, estimated_prompt_tokens
+
+async def stream_article_summary(stream, estimated_prompt_tokens: int, article: dict, model_name: str, store_in_neo4j: bool):
+    """Yield summary text from an open stream as it arrives, then log usage and queue the Neo4j write.
+    
+    Usage and any partial summary are also recorded when the client disconnects or the stream
+    fails part-way, since OpenAI bills the tokens generated up to that point.
+    """
+    parts = []
+    output_tokens = 0
+    usage = None
+    try:
+        async for chunk in stream:
+            if chunk.usage:
+                usage = chunk.usage
+            if chunk.choices and chunk.choices[0].delta.content:
+                output_tokens += 1  # each content chunk carries about one token
+                parts.append(chunk.choices[0].delta.content)
+                yield chunk.choices[0].delta.content
+    finally:
+        # Synchronous bookkeeping first: on cancellation the awaits below may not get to run
+        if usage:
+            prompt_tokens = usage.prompt_tokens
+            output_tokens = usage.completion_tokens
+        else:
+            # No usage chunk (disconnect or stream cut short): use the prompt estimate and chunk count
+            prompt_tokens = estimated_prompt_tokens
+        total_tokens = prompt_tokens + output_tokens
+        cost_usd = estimate_cost(model_name, prompt_tokens, output_tokens)
+
+        log_usage(model_name, prompt_tokens, output_tokens, total_tokens, cost_usd)
+
+        print(f"Stream - Input: {prompt_tokens}, Output: {output_tokens}, Total: {total_tokens}, Cost: ${cost_usd:.6f}")
+
+        summary = "".join(parts).strip()
+        if store_in_neo4j and summary:
+            # Runs in the thread pool so the response can finish without waiting on Neo4j
+            parse_pool.submit(neo4j_service.store_article, {
+                "url": article["url"],
+                "headline": article["headline"],
+                "publication_date": article["publication_date"],
+                "source": article["source"],
+                "summary": summary,
+                "tokens_used": total_tokens,
+                "cost_usd": cost_usd
+            })
+
+        # Release the upstream response so it stops generating and frees its pooled connection
+        await asyncio.shield(asyncio.ensure_future(stream.close()))
+
+# Shared across requests so concurrent /summarize calls stay within the same bound
+article_semaphore = asyncio.Semaphore(MAX_CONCURRENT_ARTICLES)
+
+async def summarize_article_limited(url: str, model_name: str) -> dict:
+    """Summarize an article while holding a slot in the shared concurrency limit."""
+    async with article_semaphore:
+        print(f"\nProcessing: {url}")
+        return await summarize_article(url, model_name)
+
+async def fetch_article_limited(url: str) -> dict:
+    """Fetch an article while holding a slot in the shared concurrency limit."""
+    async with article_semaphore:
+        print(f"\nFetching: {url}")
+        return await fetch_article(url)
+
+async def summarize_batch_limited(articles: List[dict], model_name: str) -> List[dict]:
+    """Run one multi-article summary call while holding a slot in the shared concurrency limit."""
+    async with article_semaphore:
+        return await summarize_articles_batch(articles, model_name)
+
+async def summarize_urls_batched(urls: List[str], model_name: str, articles_per_call: int) -> List[dict]:
+    """Fetch all URLs, then summarize them articles_per_call at a time. Results follow urls order."""
+    fetched = await asyncio.gather(*[fetch_article_limited(url) for url in urls], return_exceptions=True)
+
+    results = [None] * len(urls)
+    articles = []
+    for i, article in enumerate(fetched):
+        if isinstance(article, Exception):
+            results[i] = {"error": f"Error processing article: {str(article)}"}
+        else:
+            articles.append((i, article))
+
+    chunks = [articles[j:j + articles_per_call] for j in range(0, len(articles), articles_per_call)]
+    chunk_results = await asyncio.gather(
+        *[summarize_batch_limited([article for _, article in chunk], model_name) for chunk in chunks],
+        return_exceptions=True
+    )
+
+    for chunk, chunk_result in zip(chunks, chunk_results):
+        for k, (i, _) in enumerate(chunk):
+            if isinstance(chunk_result, Exception):
+                results[i] = {"error": f"Error processing article: {str(chunk_result)}"}
             else:
-                print("Summary was empty, retrying...")
-                time.sleep(1)  # brief pause before retry
+                results[i] = chunk_result[k]
 
-        return {"error": "Summary could not be generated after multiple attempts."}
+    return results
+
+# --- OPENAI BATCH API ---
+def build_batch_api_line(article: dict, model_name: str) -> str:
+    """One JSONL request line for the OpenAI Batch API.
     
-    except Exception as e:
-        return {"error": f"Error processing article: {str(e)}"}
+    The article's metadata travels in custom_id so results can be matched up without local state.
+    """
+    custom_id = json.dumps({
+        "url": article["url"],
+        "headline": article["headline"],
+        "publication_date": article["publication_date"],
+        "source": article["source"]
+    })
+    user_content = build_user_content(article["text"], article["publication_date"], article["source"], article["headline"])
+    return json.dumps({
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": "/v1/chat/completions",
+        "body": {
+            "model": model_name,
+            "messages": [SYSTEM_MSG, {"role": "user", "content": user_content}],
+            "temperature": 0.3,
+            "max_completion_tokens": MAX_SUMMARY_TOKENS
+        }
+    })
+
+def claim_batch_results(batch_id: str) -> bool:
+    """Record that a completed batch's results are being handled; True only for the first caller.
+    
+    The marker file is created with O_EXCL, so exactly one poll wins even across worker processes.
+    """
+    try:
+        os.makedirs(BATCH_MARKER_DIR, exist_ok=True)
+        fd = os.open(os.path.join(BATCH_MARKER_DIR, f"{batch_id}.done"), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        os.close(fd)
+        return True
+    except FileExistsError:
+        return False
+    except OSError as e:
+        print(f"⚠ Warning: Could not record batch {batch_id} as handled: {e}")
+        return True
+
+def parse_batch_api_line(line: str, model_name: str) -> tuple[str, dict]:
+    """Turn one Batch API output/error line into (url, result)."""
+    item = json.loads(line)
+    meta = json.loads(item["custom_id"])
+    response = item.get("response") or {}
+
+    if item.get("error") or response.get("status_code") != 200:
+        error = item.get("error") or response.get("body", {}).get("error")
+        return meta["url"], {"error": f"Batch request failed: {error}"}
+
+    body = response["body"]
+    summary = (body["choices"][0]["message"]["content"] or "").strip()
+    if not summary:
+        return meta["url"], {"error": "Summary could not be generated."}
+
+    prompt_tokens = body["usage"]["prompt_tokens"]
+    output_tokens = body["usage"]["completion_tokens"]
+    return meta["url"], {
+        "headline": meta["headline"],
+        "publication_date": meta["publication_date"],
+        "source": meta["source"],
+        "summary": summary,
+        "tokens_used": prompt_tokens + output_tokens,
+        "prompt_tokens": prompt_tokens,
+        "output_tokens": output_tokens,
+        "cost_usd": estimate_cost(model_name, prompt_tokens, output_tokens) * BATCH_API_DISCOUNT
+    }
 
 # --- API ENDPOINTS ---
+def summarize_response(success: bool, message: str, data: Optional[dict] = None, error: Optional[str] = None) -> ORJSONResponse:
+    """Body for the /summarize endpoints, serialized with orjson without pydantic response validation."""
+    return ORJSONResponse({
+        "success": success,
+        "message": message,
+        "data": data,
+        "error": error
+    })
+
 @app.get("/")
 async def root():
     """Root endpoint with API information."""
@@ -476,6 +1113,9 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "/summarize": "POST - Summarize multiple articles",
+            "/summarize/stream": "POST - Stream the summary of one article",
+            "/summarize/batch": "POST - Submit an offline OpenAI Batch API job",
+            "/summarize/batch/{batch_id}": "GET - Batch job status and results",
             "/articles": "GET - Retrieve articles from Neo4j",
             "/sources": "GET - Get all sources",
             "/statistics": "GET - Get summary statistics",
@@ -487,7 +1127,7 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    neo4j_status = "connected" if neo4j_service.connect() else "disconnected"
+    neo4j_status = "connected" if neo4j_service.verify_connectivity() else "disconnected"
     return {
         "status": "healthy", 
         "timestamp": datetime.now().isoformat(),
@@ -503,8 +1143,8 @@ async def get_models():
         "default_model": model
     }
 
-@app.post("/summarize", response_model=SummarizeResponse)
-async def summarize_articles(request: SummarizeRequest, background_tasks: BackgroundTasks):
+@app.post("/summarize")
+async def summarize_articles(request: SummarizeRequest):
     """Summarize multiple articles from URLs."""
     try:
         if not request.urls:
@@ -513,37 +1153,67 @@ async def summarize_articles(request: SummarizeRequest, background_tasks: Backgr
         if len(request.urls) > 10:  # Limit to prevent abuse
             raise HTTPException(status_code=400, detail="Maximum 10 URLs allowed per request")
         
+        if not 1 <= request.articles_per_call <= MAX_ARTICLES_PER_CALL:
+            raise HTTPException(status_code=400, detail=f"articles_per_call must be between 1 and {MAX_ARTICLES_PER_CALL}")
+        
         results = {}
         total_cost = 0
         total_tokens = 0
         
+        valid_urls = []
         for url in request.urls:
             if not url.startswith(('http://', 'https://')):
                 results[url] = {"error": "Invalid URL format"}
-                continue
+            elif url not in valid_urls:
+                valid_urls.append(url)
+        
+        # Skip OpenAI for URLs that already have a stored summary (one Neo4j round-trip,
+        # in a worker thread so a slow or unreachable Neo4j does not stall the event loop)
+        cached = {}
+        if request.use_cache and valid_urls:
+            cached = await asyncio.to_thread(neo4j_service.get_articles_by_urls, valid_urls)
+        for url, article in cached.items():
+            article.pop("url")
+            article["cached"] = True
+            results[url] = article
+        
+        # Fetch and summarize the remaining articles concurrently
+        urls_to_summarize = [url for url in valid_urls if url not in cached]
+        if request.articles_per_call > 1:
+            results_list = await summarize_urls_batched(urls_to_summarize, request.model, request.articles_per_call)
+        else:
+            tasks = [summarize_article_limited(url, request.model) for url in urls_to_summarize]
+            results_list = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        articles_to_store = []
+        for url, result in zip(urls_to_summarize, results_list):
+            if isinstance(result, Exception):
+                result = {"error": f"Error processing article: {str(result)}"}
             
-            print(f"\nProcessing: {url}")
-            result = summarize_article(url, request.model)
+            # Failed articles can still carry billed usage (e.g. their share of a multi-article call)
+            total_cost += result.get("cost_usd", 0)
+            total_tokens += result.get("tokens_used", 0)
             
-            if "error" not in result:
-                total_cost += result["cost_usd"]
-                total_tokens += result["tokens_used"]
-                
-                # Store in Neo4j if requested
-                if request.store_in_neo4j:
-                    article_data = {
-                        "url": url,
-                        "headline": result["headline"],
-                        "publication_date": result["publication_date"],
-                        "source": result["source"],
-                        "summary": result["summary"],
-                        "tokens_used": result["tokens_used"],
-                        "cost_usd": result["cost_usd"]
-                    }
-                    neo4j_service.store_article(article_data)
+            if "error" not in result and request.store_in_neo4j:
+                articles_to_store.append({
+                    "url": url,
+                    "headline": result["headline"],
+                    "publication_date": result["publication_date"],
+                    "source": result["source"],
+                    "summary": result["summary"],
+                    "tokens_used": result["tokens_used"],
+                    "cost_usd": result["cost_usd"]
+                })
             
             results[url] = result
         
+        # Store all successful summaries in Neo4j in one round-trip if requested
+        if articles_to_store:
+            await asyncio.to_thread(neo4j_service.store_articles_bulk, articles_to_store)
+        
+        # Keep summaries in the order the URLs were submitted
+        results = {url: results[url] for url in request.urls}
+        
         # Save to file if requested
         saved_file = None
         if request.save_to_file:
@@ -551,9 +1221,9 @@ async def summarize_articles(request: SummarizeRequest, background_tasks: Backgr
         
         # Log git commit if file was saved
         if saved_file:
-            background_tasks.add_task(git_push_commit, saved_file, f"Update summaries file: {saved_file}")
+            queue_git_push(saved_file)
         
-        return SummarizeResponse(
+        return summarize_response(
             success=True,
             message=f"Successfully processed {len(request.urls)} articles",
             data={
@@ -565,6 +1235,157 @@ async def summarize_articles(request: SummarizeRequest, background_tasks: Backgr
             }
         )
     
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+@app.post("/summarize/stream")
+async def summarize_article_stream(request: StreamSummarizeRequest):
+    """Summarize one article, streaming the summary as plain text while it is generated."""
+    if not request.url.startswith(('http://', 'https://')):
+        raise HTTPException(status_code=400, detail="Invalid URL format")
+    
+    try:
+        article = await fetch_article_limited(request.url)
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Error processing article: {str(e)}")
+    
+    try:
+        stream, estimated_prompt_tokens = await open_article_stream(article, request.model)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error starting summary: {str(e)}")
+    
+    return StreamingResponse(
+        stream_article_summary(stream, estimated_prompt_tokens, article, request.model, request.store_in_neo4j),
+        media_type="text/plain; charset=utf-8"
+    )
+
+@app.post("/summarize/batch")
+async def submit_summarize_batch(request: BatchSummarizeRequest):
+    """Fetch articles and submit their summaries as an OpenAI Batch API job."""
+    try:
+        if not request.urls:
+            raise HTTPException(status_code=400, detail="No URLs provided")
+        
+        if len(request.urls) > MAX_BATCH_API_URLS:
+            raise HTTPException(status_code=400, detail=f"Maximum {MAX_BATCH_API_URLS} URLs allowed per batch")
+        
+        errors = {}
+        valid_urls = []
+        for url in request.urls:
+            if not url.startswith(('http://', 'https://')):
+                errors[url] = {"error": "Invalid URL format"}
+            elif url not in valid_urls:
+                valid_urls.append(url)
+        
+        fetched = await asyncio.gather(*[fetch_article_limited(url) for url in valid_urls], return_exceptions=True)
+        
+        lines = []
+        for url, article in zip(valid_urls, fetched):
+            if isinstance(article, Exception):
+                errors[url] = {"error": f"Error processing article: {str(article)}"}
+            else:
+                lines.append(build_batch_api_line(article, request.model))
+        
+        if not lines:
+            raise HTTPException(status_code=400, detail="None of the articles could be fetched")
+        
+        batch_file = await client.files.create(
+            file=("summaries_batch.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = await client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+            metadata={"model": request.model, "store_in_neo4j": str(request.store_in_neo4j).lower()}
+        )
+        
+        return summarize_response(
+            success=True,
+            message=f"Submitted {len(lines)} articles as batch {batch.id}",
+            data={
+                "batch_id": batch.id,
+                "status": batch.status,
+                "submitted": len(lines),
+                "errors": errors
+            }
+        )
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+@app.get("/summarize/batch/{batch_id}")
+async def get_summarize_batch(batch_id: str):
+    """Poll an OpenAI Batch API job; once completed, return and store its summaries."""
+    try:
+        batch = await client.batches.retrieve(batch_id)
+        
+        if batch.status != "completed":
+            return summarize_response(
+                success=True,
+                message=f"Batch {batch_id} is {batch.status}",
+                data={
+                    "batch_id": batch_id,
+                    "status": batch.status,
+                    "request_counts": batch.request_counts.model_dump() if batch.request_counts else None
+                }
+            )
+        
+        metadata = batch.metadata or {}
+        model_name = metadata.get("model", model)
+        store_in_neo4j = metadata.get("store_in_neo4j") == "true"
+        
+        results = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            content = await client.files.content(file_id)
+            for line in content.text.splitlines():
+                if line.strip():
+                    url, result = parse_batch_api_line(line, model_name)
+                    results[url] = result
+        
+        # Results are returned on every poll, but only logged and stored on the first completed one
+        first_poll = claim_batch_results(batch.id)
+        total_cost = 0
+        total_tokens = 0
+        articles_to_store = []
+        for url, result in results.items():
+            if "error" in result:
+                continue
+            
+            prompt_tokens = result.pop("prompt_tokens")
+            output_tokens = result.pop("output_tokens")
+            total_cost += result["cost_usd"]
+            total_tokens += result["tokens_used"]
+            
+            if not first_poll:
+                continue
+            
+            log_usage(model_name, prompt_tokens, output_tokens, result["tokens_used"], result["cost_usd"])
+            if store_in_neo4j:
+                articles_to_store.append({"url": url, **result})
+        
+        if articles_to_store:
+            await asyncio.to_thread(neo4j_service.store_articles_bulk, articles_to_store)
+        
+        return summarize_response(
+            success=True,
+            message=f"Batch {batch_id} completed with {len(results)} articles",
+            data={
+                "batch_id": batch_id,
+                "status": batch.status,
+                "summaries": results,
+                "total_cost_usd": round(total_cost, 6),
+                "total_tokens": total_tokens,
+                "stored_in_neo4j": store_in_neo4j
+            }
+        )
+    
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
@@ -578,11 +1399,11 @@ async def get_articles(
     """Retrieve articles from Neo4j with optional filters."""
     try:
         articles = neo4j_service.get_articles(limit, source, date_from, date_to)
-        return {
+        return ORJSONResponse({
             "success": True,
             "count": len(articles),
             "articles": articles
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving articles: {str(e)}")
 
@@ -591,11 +1412,11 @@ async def get_sources():
     """Get all unique sources with article counts."""
     try:
         sources = neo4j_service.get_sources()
-        return {
+        return ORJSONResponse({
             "success": True,
             "count": len(sources),
             "sources": sources
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving sources: {str(e)}")
 
@@ -604,10 +1425,10 @@ async def get_statistics():
     """Get summary statistics from Neo4j."""
     try:
         stats = neo4j_service.get_statistics()
-        return {
+        return ORJSONResponse({
             "success": True,
             "statistics": stats
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving statistics: {str(e)}")
 
@@ -621,24 +1442,17 @@ async def query_articles(request: Neo4jQueryRequest):
             request.date_from,
             request.date_to
         )
-        return {
+        return ORJSONResponse({
             "success": True,
             "count": len(articles),
             "articles": articles
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error querying articles: {str(e)}")
 
 # --- ENTRY POINT ---
 if __name__ == "__main__":
     print("Starting Article Summarizer API with Neo4j...")
-    
-    # Initialize Neo4j connection
-    if neo4j_service.connect():
-        neo4j_service.create_constraints_and_indexes()
-    else:
-        print("⚠ Warning: Neo4j connection failed. Some features may not work.")
-    
     print("API will be available at: http://localhost:8000")
     print("Documentation available at: http://localhost:8000/docs")
     
@@ -647,10 +1461,10 @@ if __name__ == "__main__":
             "main-orig:app",
             host="0.0.0.0",
             port=8000,
-            reload=True
+            loop="uvloop",
+            http="httptools",
+            reload=API_RELOAD,
+            workers=1 if API_RELOAD else API_WORKERS
         )
     except KeyboardInterrupt:
         print("\nShutting down...")
-    finally:
-        neo4j_service.close()
-        print("Neo4j connection closed.")
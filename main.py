@@ -13,10 +13,13 @@ articles = {
     "Reuters": "https://www.reuters.com/world/europe/european-elections-2025-08-21/",
 }
 
+# One session for all fetches so connections to the same host are reused
+session = requests.Session()
+
 # Function to fetch article content (very simplified)
 def fetch_article(url):
     try:
-        response = requests.get(url, timeout=10)
+        response = session.get(url, timeout=10)
         response.raise_for_status()
         return response.text[:4000]  # crude: truncate to avoid token overflow
     except Exception as e: